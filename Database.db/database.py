@@ -1,6 +1,6 @@
+import csv
 import sqlite3
-import pandas as pd
-from typing import List, Tuple, Optional, Any, Dict
+from typing import List, Tuple, Optional, Any, Dict, Iterator
 import logging
 
 # Set up logging
@@ -32,6 +32,10 @@ class DatabaseManager:
             self.cursor = self.connection.cursor()
             # Enable foreign keys
             self.cursor.execute("PRAGMA foreign_keys = ON")
+            # WAL with NORMAL sync: commits skip the rollback-journal fsync and readers don't block the writer
+            self.cursor.execute("PRAGMA journal_mode = WAL")
+            self.cursor.execute("PRAGMA synchronous = NORMAL")
+            self.cursor.execute("PRAGMA temp_store = MEMORY")
             logger.info(f"Successfully connected to database: {self.db_name}")
         except sqlite3.Error as e:
             logger.error(f"Error connecting to database: {e}")
@@ -196,6 +200,7 @@ class DatabaseManager:
             with open(file_path, 'r') as file:
                 lines = file.readlines()
             
+            rows = []
             for line in lines:
                 line = line.strip()
                 if not line or line.startswith('#'):
@@ -204,22 +209,15 @@ class DatabaseManager:
                 # Assuming format: username,password_hash,role
                 parts = [part.strip() for part in line.split(',')]
                 if len(parts) >= 3:
-                    username, password_hash, role = parts[0], parts[1], parts[2]
-                    
-                    # Check if user already exists
-                    existing_user = self.execute_query(
-                        "SELECT id FROM users WHERE username = ?", 
-                        (username,)
-                    )
-                    
-                    if not existing_user:
-                        success = self.insert_record('users', {
-                            'username': username,
-                            'password_hash': password_hash,
-                            'role': role
-                        })
-                        if success:
-                            migrated_count += 1
+                    rows.append((parts[0], parts[1], parts[2]))
+            
+            # One statement for the whole file; the UNIQUE username skips existing users
+            before = self.connection.total_changes
+            if self.execute_many(
+                "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+                rows
+            ):
+                migrated_count = self.connection.total_changes - before
             
             logger.info(f"Successfully migrated {migrated_count} users to database.")
             return migrated_count
@@ -233,7 +231,11 @@ class DatabaseManager:
     
     def load_csv_data(self, csv_file_path: str, table_name: str) -> bool:
         """
-        Load data from CSV file into specified table using pandas.
+        Load data from CSV file into specified table.
+        
+        Rows are streamed straight from the csv module into a single executemany
+        call, so no DataFrame is built. Empty fields are stored as NULL and
+        SQLite's column affinity converts numeric text as to_sql did.
         
         Args:
             csv_file_path (str): Path to the CSV file
@@ -242,15 +244,42 @@ class DatabaseManager:
         Returns:
             bool: True if loading successful, False otherwise
         """
+        # Sanitize table name
+        if not table_name.replace('_', '').isalnum():
+            logger.error(f"Invalid table name: {table_name}")
+            return False
+        
         try:
-            # Read CSV file
-            df = pd.read_csv(csv_file_path)
-            
-            # Convert column names to lowercase for consistency
-            df.columns = [col.lower() for col in df.columns]
-            
-            # Load data into SQLite table
-            df.to_sql(table_name, self.connection, if_exists='append', index=False)
+            with open(csv_file_path, newline='', encoding='utf-8') as csv_file:
+                reader = csv.reader(csv_file)
+                
+                # Convert column names to lowercase for consistency
+                columns = [col.strip().lower() for col in next(reader)]
+                
+                table_columns = self.get_table_columns(table_name)
+                if not table_columns:
+                    logger.error(f"Table {table_name} does not exist")
+                    return False
+                
+                # Header names are interpolated into the SQL, so they must be real columns
+                unknown = set(columns) - set(table_columns)
+                if unknown:
+                    logger.error(f"Unknown columns for {table_name}: {', '.join(sorted(unknown))}")
+                    return False
+                
+                placeholders = ', '.join(['?' for _ in columns])
+                query = f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+                rows = ([value if value != '' else None for value in row] for row in reader if row)
+                
+                # Larger page cache (64 MB) for the bulk insert, restored afterwards
+                self.cursor.execute("PRAGMA cache_size")
+                previous_cache_size = self.cursor.fetchone()[0]
+                self.cursor.execute("PRAGMA cache_size = -65536")
+                try:
+                    if not self.execute_many(query, rows):
+                        return False
+                finally:
+                    self.cursor.execute(f"PRAGMA cache_size = {int(previous_cache_size)}")
             
             logger.info(f"Successfully loaded data from {csv_file_path} into {table_name} table.")
             return True
@@ -258,6 +287,9 @@ class DatabaseManager:
         except FileNotFoundError:
             logger.error(f"CSV file not found: {csv_file_path}")
             return False
+        except StopIteration:
+            logger.error(f"CSV file is empty: {csv_file_path}")
+            return False
         except Exception as e:
             logger.error(f"Error loading CSV data: {e}")
             return False
@@ -281,6 +313,38 @@ class DatabaseManager:
         result = self.execute_query(query)
         return result or []
     
+    def iter_records(self, table_name: str, batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        Yield all records from a table, fetched batch_size rows at a time.
+        
+        Unlike get_all_records, the full result set is never held in memory.
+        A separate cursor is used so other queries can run while iterating.
+        
+        Args:
+            table_name (str): Name of the table
+            batch_size (int): Number of rows fetched per round trip
+            
+        Yields:
+            Tuple: One record at a time
+        """
+        # Sanitize table name
+        if not table_name.replace('_', '').isalnum():
+            logger.error(f"Invalid table name: {table_name}")
+            return
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SELECT * FROM {table_name}")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        except sqlite3.Error as e:
+            logger.error(f"Database error: {e}")
+        finally:
+            cursor.close()
+    
     def get_records_with_limit(self, table_name: str, limit: int = 100, offset: int = 0) -> List[Tuple]:
         """
         Retrieve records with pagination.
@@ -481,9 +545,13 @@ class DatabaseManager:
             logger.error(f"Invalid table name: {table_name}")
             return []
         
-        query = f"PRAGMA table_info({table_name})"
-        result = self.execute_query(query)
-        return [column[1] for column in result] if result else []
+        # execute_query only returns rows for SELECT statements, so read the PRAGMA directly
+        try:
+            self.cursor.execute(f"PRAGMA table_info({table_name})")
+            return [column[1] for column in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"Database error: {e}")
+            return []
     
     def record_exists(self, table_name: str, column: str, value: Any) -> bool:
         """
@@ -551,16 +619,20 @@ class DatabaseManager:
         Returns:
             Dict[str, int]: Table name -> row count
         """
-        stats = {}
         tables = ['users', 'cyber_incidents', 'datasets_metadata', 'it_tickets', 'user_activity']
         
-        for table in tables:
-            query = f"SELECT COUNT(*) FROM {table}"
-            result = self.execute_query(query)
-            if result:
-                stats[table] = result[0][0]
+        # Only count tables that exist, so one missing table still leaves partial stats
+        existing = {row[0] for row in self.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'table'"
+        ) or []}
+        tables = [table for table in tables if table in existing]
+        if not tables:
+            return {}
         
-        return stats
+        # All counts in one round trip (each COUNT(*) still scans its table)
+        query = "SELECT " + ", ".join(f"(SELECT COUNT(*) FROM {table})" for table in tables)
+        result = self.execute_query(query)
+        return dict(zip(tables, result[0])) if result else {}
     
     def backup_database(self, backup_path: str) -> bool:
         """
@@ -1,7 +1,11 @@
 import sqlite3
+import threading
 import pandas as pd
 from typing import List, Tuple, Optional, Any, Dict
 
+# Rows per pandas chunk when loading CSV files
+CSV_CHUNK_ROWS = 50_000
+
 class DatabaseManager:
     """
     A class to manage SQLite database operations for the Multi-Domain Intelligence Platform.
@@ -18,12 +22,14 @@ class DatabaseManager:
         self.db_name = db_name
         self.connection = None
         self.cursor = None
+        # One instance may be shared by every Streamlit session thread
+        self._lock = threading.Lock()
         self.connect()
     
     def connect(self) -> None:
         """Establish connection to the SQLite database and create cursor."""
         try:
-            self.connection = sqlite3.connect(self.db_name)
+            self.connection = sqlite3.connect(self.db_name, check_same_thread=False)
             self.cursor = self.connection.cursor()
             print(f"Successfully connected to database: {self.db_name}")
         except sqlite3.Error as e:
@@ -41,23 +47,49 @@ class DatabaseManager:
         Returns:
             Optional[List[Tuple]]: Query results if it's a SELECT query, None otherwise
         """
-        try:
-            self.cursor.execute(query, params)
+        with self._lock:
+            try:
+                self.cursor.execute(query, params)
+                
+                # If it's a SELECT query, return results
+                if query.strip().upper().startswith('SELECT'):
+                    return self.cursor.fetchall()
+                else:
+                    # For INSERT, UPDATE, DELETE - commit the changes
+                    self.connection.commit()
+                    return None
+                    
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                print(f"Failed query: {query}")
+                if self.connection:
+                    self.connection.rollback()  # Rollback on error
+                return None
+    
+    def execute_many(self, query: str, params_list: List[Tuple]) -> Optional[int]:
+        """
+        Execute one statement for many parameter tuples in a single transaction.
+        
+        The changed-row count is taken while holding the lock, so writes from
+        other sessions sharing this connection are not included.
+        
+        Args:
+            query (str): The SQL query to execute
+            params_list (List[Tuple]): List of parameter tuples
             
-            # If it's a SELECT query, return results
-            if query.strip().upper().startswith('SELECT'):
-                return self.cursor.fetchall()
-            else:
-                # For INSERT, UPDATE, DELETE - commit the changes
+        Returns:
+            Optional[int]: Number of rows changed, or None on error
+        """
+        with self._lock:
+            try:
+                before = self.connection.total_changes
+                self.cursor.executemany(query, params_list)
                 self.connection.commit()
+                return self.connection.total_changes - before
+            except sqlite3.Error as e:
+                print(f"Database error in executemany: {e}")
+                self.connection.rollback()
                 return None
-                
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            print(f"Failed query: {query}")
-            if self.connection:
-                self.connection.rollback()  # Rollback on error
-            return None
     
     def create_tables(self) -> bool:
         """
@@ -178,23 +210,21 @@ class DatabaseManager:
             with open(file_path, 'r') as file:
                 lines = file.readlines()
             
-            migrated_count = 0
+            rows = []
             for line in lines:
                 if line.strip():
                     # Assuming format: username,password_hash,role
                     parts = line.strip().split(',')
                     if len(parts) >= 3:
-                        username, password_hash, role = parts[0], parts[1], parts[2]
-                        
-                        # Check if user already exists
-                        existing_user = self.get_user_by_username(username)
-                        
-                        if not existing_user:
-                            self.execute_query(
-                                "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                                (username, password_hash, role)
-                            )
-                            migrated_count += 1
+                        rows.append((parts[0], parts[1], parts[2]))
+            
+            # One statement for the whole file; the UNIQUE username skips existing users
+            migrated_count = self.execute_many(
+                "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+                rows
+            )
+            if migrated_count is None:
+                return False
             
             print(f"Successfully migrated {migrated_count} users to database.")
             return True
@@ -217,22 +247,28 @@ class DatabaseManager:
         Returns:
             bool: True if loading successful, False otherwise
         """
-        try:
-            # Read CSV file
-            df = pd.read_csv(csv_file_path)
-            
-            # Load data into SQLite table
-            df.to_sql(table_name, self.connection, if_exists='append', index=False)
-            self.connection.commit()
-            
-            print(f"Successfully loaded data from {csv_file_path} into {table_name} table.")
-            return True
-            
-        except Exception as e:
-            print(f"Error loading CSV data: {e}")
-            if self.connection:
-                self.connection.rollback()
-            return False
+        with self._lock:
+            try:
+                # Stream the file in chunks so memory stays bounded by CSV_CHUNK_ROWS.
+                # Values are read as text (no type inference); SQLite's column affinity
+                # stores them as REAL/INTEGER where the schema says so. All chunks go
+                # into one transaction, so a bad row leaves the table untouched.
+                for chunk in pd.read_csv(csv_file_path, chunksize=CSV_CHUNK_ROWS, dtype=str):
+                    columns = ', '.join(f'"{column}"' for column in chunk.columns)
+                    placeholders = ', '.join(['?' for _ in chunk.columns])
+                    query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+                    rows = chunk.astype(object).where(chunk.notna(), None)
+                    self.cursor.executemany(query, rows.itertuples(index=False, name=None))
+                self.connection.commit()
+                
+                print(f"Successfully loaded data from {csv_file_path} into {table_name} table.")
+                return True
+                
+            except Exception as e:
+                print(f"Error loading CSV data: {e}")
+                if self.connection:
+                    self.connection.rollback()
+                return False
     
     def get_all_records(self, table_name: str) -> List[Tuple]:
         """
@@ -415,33 +451,31 @@ class DatabaseManager:
             ('Daniel_admin', 'password123', 'it_administrator')
         ]
         
-        created_count = 0
+        # One lookup for all demo users, then hash only the missing ones
+        existing = {row[0] for row in self.execute_query("SELECT username FROM users") or []}
+        
+        rows = []
         for username, password, role in demo_users:
-            # Check if user already exists
-            existing_user = self.get_user_by_username(username)
-            
-            if not existing_user:
-                try:
-                    # Hash password
-                    hashed_pw = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-                    
-                    # Insert user
-                    self.execute_query(
-                        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                        (username, hashed_pw, role)
-                    )
-                    created_count += 1
-                    print(f"Created demo user: {username}")
-                    
-                except Exception as e:
-                    # If bcrypt fails, use pre-hashed password for 'password123'
-                    pre_hashed = '$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW'
-                    self.execute_query(
-                        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                        (username, pre_hashed, role)
-                    )
-                    created_count += 1
-                    print(f"Created demo user with pre-hashed password: {username}")
+            if username in existing:
+                continue
+            try:
+                # Hash password
+                hashed_pw = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+            except Exception as e:
+                # If bcrypt fails, use pre-hashed password for 'password123'
+                hashed_pw = '$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW'
+                print(f"Using pre-hashed password for demo user: {username}")
+            rows.append((username, hashed_pw, role))
+        
+        created_count = 0
+        if rows:
+            inserted = self.execute_many(
+                "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+                rows
+            )
+            if inserted is not None:
+                created_count = inserted
+                print(f"Created {created_count} demo users.")
         
         return created_count
     
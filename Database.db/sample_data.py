@@ -61,7 +61,11 @@ def load_data_from_csv_files(db):
     results = {}
     
     for csv_file, table_name in csv_mapping.items():
-        if os.path.exists(csv_file):
+        # Load each table once - re-running the loader would duplicate every row
+        if db.execute_query(f"SELECT 1 FROM {table_name} LIMIT 1"):
+            print(f"⏭️  {table_name} already has data, skipping {csv_file}")
+            results[table_name] = "⏭️ Already Loaded"
+        elif os.path.exists(csv_file):
             if db.load_csv_data(csv_file, table_name):
                 results[table_name] = "✅ Success"
             else:
@@ -91,17 +91,18 @@ def display_current_users(db_manager):
     print("\n👥 Current users in database:")
     print("-" * 50)
     
-    users = db_manager.get_all_records('users')
+    # Stream the rows instead of loading the whole table at once
+    found = False
+    for user in db_manager.iter_records('users'):
+        found = True
+        user_id, username, password_hash, role, created_at = user
+        print(f"   ID: {user_id}, Username: {username}, Role: {role}")
+        print(f"      Hash: {password_hash[:20]}...")  # Show first 20 chars of hash
+        print(f"      Created: {created_at}")
+        print()
     
-    if not users:
+    if not found:
         print("   No users found in database.")
-    else:
-        for user in users:
-            user_id, username, password_hash, role, created_at = user
-            print(f"   ID: {user_id}, Username: {username}, Role: {role}")
-            print(f"      Hash: {password_hash[:20]}...")  # Show first 20 chars of hash
-            print(f"      Created: {created_at}")
-            print()
 
 def create_sample_users_file():
     """Create a sample users.txt file if it doesn't exist (for testing)."""
@@ -6,6 +6,12 @@ Secure, robust version with all fixes applied
 import streamlit as st
 import os
 import sys
+import asyncio
+import hashlib
+import zlib
+import pandas as pd
+import numpy as np
+from dataclasses import dataclass
 from datetime import datetime
 
 # Load environment variables from .env file
@@ -15,6 +21,25 @@ try:
 except ImportError:
     pass
 
+# OpenAI SDK - the AI features report "not installed" without it
+try:
+    import openai
+except ImportError:
+    openai = None
+
+# Optional on-disk chat history - the assistant keeps history in the session only without it
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+# External dashboard page - Python loads it once per process (sys.modules); the built-in
+# fallback is used if it is missing or fails while importing
+try:
+    from pages.dashboard import main as dashboard_main
+except Exception:
+    dashboard_main = None
+
 # Set page config - MUST BE FIRST
 st.set_page_config(
     page_title="Intelligence Platform",
@@ -23,87 +48,160 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Default number of trailing chat messages sent to OpenAI with each request
+MAX_CTX_MSGS = 10
+
 # Initialize ALL session state variables at the top
-if 'logged_in' not in st.session_state:
-    st.session_state.logged_in = False
-if 'username' not in st.session_state:
-    st.session_state.username = ""
-if 'user_role' not in st.session_state:
-    st.session_state.user_role = ""
-if 'current_page' not in st.session_state:
-    st.session_state.current_page = "login"
-if 'openai_client' not in st.session_state:
-    st.session_state.openai_client = None
-if 'openai_available' not in st.session_state:
-    st.session_state.openai_available = False
-if 'openai_error' not in st.session_state:
-    st.session_state.openai_error = ""
-if 'messages' not in st.session_state:
-    st.session_state.messages = []
-if 'last_activity' not in st.session_state:
-    st.session_state.last_activity = datetime.now()
+SESSION_DEFAULTS = {
+    "logged_in": False,
+    "username": "",
+    "user_role": "",
+    "current_page": "login",
+    "openai_available": False,
+    "openai_error": "",
+    "context_window": MAX_CTX_MSGS,
+}
+for key, value in SESSION_DEFAULTS.items():
+    st.session_state.setdefault(key, value)
+# The settings slider owns context_window; re-assigning it keeps the value when
+# the settings page (and so the widget) is not rendered
+st.session_state.context_window = st.session_state.context_window
+# Per-session values - a fresh list and the current time, not shared module objects
+st.session_state.setdefault("messages", [])
+st.session_state.setdefault("last_activity", datetime.now())
+
+# Sidebar navigation entries (app.py re-runs top to bottom, so these are rebuilt each rerun)
+MENU_ITEMS = [
+    ("🏠 Home", "home"),
+    ("📊 Dashboard", "dashboard"),
+    ("🤖 AI Assistant", "assistant"),
+    ("🔒 Security Tools", "security"),
+    ("📈 Analytics", "analytics"),
+    ("⚙️ Settings", "settings")
+]
+MENU_PAGES = [item_id for _, item_id in MENU_ITEMS]
+MENU_LABELS = {item_id: item_name for item_name, item_id in MENU_ITEMS}
+
+# Models checked in parallel by the settings connection test
+PROBE_MODELS = ("gpt-3.5-turbo", "gpt-4", "gpt-4o")
+
+# Sent first with every chat request - this sets the assistant's behaviour (scoped to the
+# platform's domains, concise, admits uncertainty); it is too short for provider prompt caching
+ASSISTANT_SYSTEM_PROMPT = (
+    "You are the AI assistant of the Multi-Domain Intelligence Platform. "
+    "The platform covers three domains: cybersecurity incidents, data science "
+    "datasets and IT operations tickets. Answer questions about these areas "
+    "concisely and practically, and say so when you are unsure."
+)
+
+# Number of most recent chat messages rendered on each rerun
+CHAT_RENDER_WINDOW = 50
+
+# Where saved chat histories live and how long (seconds) they are kept
+CHAT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".chat_cache")
+CHAT_CACHE_TTL = 86400
+
+# Demo accounts accepted by the login form
+DEMO_USERS = {
+    'john_analyst': {'password': 'password123', 'role': 'analyst'},
+    'sara_scientist': {'password': 'password123', 'role': 'scientist'},
+    'mike_admin': {'password': 'password123', 'role': 'admin'},
+    'Joel_analyst': {'password': 'password123', 'role': 'analyst'},
+    'Sara_scientist': {'password': 'password123', 'role': 'scientist'},
+    'Daniel_admin': {'password': 'password123', 'role': 'admin'}
+}
+DEMO_CREDS = frozenset((user, info['password']) for user, info in DEMO_USERS.items())
+DEMO_ROLES = {user: info['role'] for user, info in DEMO_USERS.items()}
+
+# Demo accounts offered as one-click logins
+QUICK_LOGINS = [
+    ("👨‍💻 John (Analyst)", "john_analyst"),
+    ("👩‍🔬 Sara (Scientist)", "sara_scientist"),
+    ("👨‍💼 Mike (Admin)", "mike_admin")
+]
+
+# Security tools per role: (banner style, banner text, [(tool, description)])
+SECURITY_TOOLS = {
+    'admin': ("success", "🛡️ Admin Security Privileges", (
+        ("User Management", "Manage user accounts and permissions"),
+        ("Access Logs", "View system access logs"),
+        ("Security Config", "Configure security settings"),
+        ("Audit Reports", "Generate security audit reports")
+    )),
+    'analyst': ("info", "📋 Analyst Security Tools", (
+        ("Threat Analysis", "Analyze security threats"),
+        ("Incident Reports", "View and create incident reports"),
+        ("Access Review", "Review user access patterns"),
+        ("Security Dashboard", "View security metrics")
+    )),
+    'viewer': ("warning", "👀 Viewer Security Access", (
+        ("Security Status", "View current security status"),
+        ("Alerts", "View security alerts"),
+        ("Guidelines", "Security guidelines and policies")
+    )),
+}
+
+@st.cache_data(show_spinner=False)
+def activity_frame(username):
+    """Recent activity table for the home page, built once per user"""
+    return pd.DataFrame({
+        "Time": ["10:30", "11:15", "12:45", "14:20"],
+        "User": ["john_analyst", "sara_scientist", "mike_admin", username],
+        "Action": ["Login", "Data Analysis", "System Update", "Dashboard Access"],
+        "Status": ["Success", "Completed", "In Progress", "Success"]
+    }).set_index("Time")
+
+@st.cache_resource(show_spinner=False)
+def build_openai_client(api_key):
+    """Create one OpenAI client (and connection pool) per API key, shared by all sessions"""
+    if openai is None:
+        raise ImportError("openai is not installed")
+    return openai.OpenAI(api_key=api_key)
+
+@dataclass(frozen=True)
+class Secrets:
+    """Secrets the app needs, resolved together"""
+    openai_api_key: str = ""
+
+@st.cache_resource(show_spinner=False)
+def load_secrets():
+    """Read secrets once per process - Streamlit secrets first, then the environment"""
+    api_key = ""
+    
+    # Method 1: Streamlit secrets (for cloud)
+    try:
+        api_key = st.secrets.get("OPENAI_API_KEY", "")
+    except FileNotFoundError:
+        pass  # no secrets.toml - fall back to the environment
+    
+    # Method 2: Environment variable
+    if not api_key:
+        api_key = os.environ.get("OPENAI_API_KEY", "")
+    
+    return Secrets(openai_api_key=api_key.strip())
 
 # OpenAI setup function - SIMPLIFIED AND FIXED
 def get_openai_client():
     """Get OpenAI client if API key is available"""
     try:
-        # Return existing client if available
-        if st.session_state.openai_client is not None:
-            return st.session_state.openai_client
-        
-        # Get API key from secrets or environment
-        api_key = None
-        
-        # Method 1: Streamlit secrets (for cloud)
-        try:
-            if hasattr(st, 'secrets'):
-                api_key = st.secrets.get("OPENAI_API_KEY", "")
-        except:
-            pass
-        
-        # Method 2: Environment variable
-        if not api_key:
-            api_key = os.environ.get("OPENAI_API_KEY", "")
+        api_key = load_secrets().openai_api_key
         
         # Check if key exists and is valid
-        if not api_key or not api_key.strip():
+        if not api_key:
             st.session_state.openai_error = "No API key found"
             return None
         
-        api_key = api_key.strip()
-        
         if not api_key.startswith("sk-"):
             st.session_state.openai_error = "Invalid API key format (should start with 'sk-')"
             return None
         
-        # Import OpenAI - handle different versions
+        # Shared client - no network call until the user asks for something
         try:
-            from openai import OpenAI
+            client = build_openai_client(api_key)
             
-            # Create simple client without extra parameters
-            client = OpenAI(api_key=api_key)
-            
-            # Test connection with timeout
-            import requests
-            import socket
-            socket.setdefaulttimeout(10)
-            
-            # Simple test
-            test_response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": "Say 'OK'"}],
-                max_tokens=5,
-                timeout=10
-            )
-            
-            if test_response.choices[0].message.content:
-                st.session_state.openai_client = client
-                st.session_state.openai_available = True
-                st.session_state.openai_error = "Connected successfully"
-                return client
-            else:
-                st.session_state.openai_error = "Test response empty"
-                return None
+            st.session_state.openai_available = True
+            st.session_state.openai_error = "Client ready"
+            return client
                 
         except ImportError:
             st.session_state.openai_error = "OpenAI package not installed"
@@ -116,23 +214,29 @@ def get_openai_client():
         st.session_state.openai_error = f"Setup error: {str(e)}"
         return None
 
+def hash_api_key(api_key):
+    """Fingerprint an API key for use as a cache key without storing the secret"""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+@st.cache_data(ttl=30, show_spinner=False)
+def probe_openai(_client, api_key_hash):
+    """Check the API with a models listing (no tokens billed), cached per key for 30s"""
+    models = _client.with_options(timeout=10).models.list()
+    next(iter(models), None)
+    return "models endpoint OK"
+
 def test_openai_connection():
     """Test OpenAI connection and update status"""
     client = get_openai_client()
     
     if client:
         try:
-            # Quick test
-            response = client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": "Say 'Connected' if working."}],
-                max_tokens=10,
-                timeout=5
-            )
+            # Repeat clicks within the TTL are served from the cache
+            message = probe_openai(client, hash_api_key(client.api_key))
             
             st.session_state.openai_available = True
             st.session_state.openai_error = "✅ Connected"
-            return True, response.choices[0].message.content
+            return True, message
             
         except Exception as e:
             st.session_state.openai_available = False
@@ -141,14 +245,45 @@ def test_openai_connection():
     
     return False, "No client available"
 
+async def check_models_async(api_key, models):
+    """Check access to several models concurrently (one lightweight GET each)"""
+    # Async clients are bound to the event loop, so one is created per run
+    client = openai.AsyncOpenAI(api_key=api_key)
+    try:
+        results = await asyncio.gather(
+            *[client.models.retrieve(model) for model in models],
+            return_exceptions=True
+        )
+    finally:
+        await client.close()
+    
+    return [(model, not isinstance(result, Exception)) for model, result in zip(models, results)]
+
+def check_models(api_key, models=PROBE_MODELS):
+    """Run the parallel model check from synchronous Streamlit code"""
+    try:
+        return asyncio.run(check_models_async(api_key, models))
+    except Exception:
+        return [(model, False) for model in models]
+
+@st.cache_data(ttl=3600, max_entries=1024, show_spinner=False)
+def cached_completion(_client, api_key_hash, model, messages, max_tokens):
+    """Non-streamed completion cached on its exact inputs (opt-in from the sidebar), up to 1024 answers"""
+    response = _client.chat.completions.create(
+        model=model,
+        messages=messages,
+        max_tokens=max_tokens
+    )
+    return response.choices[0].message.content
+
 def main():
     """Main application logic"""
     
     # Update last activity timestamp
     st.session_state.last_activity = datetime.now()
     
-    # Initialize OpenAI on first load
-    if st.session_state.openai_client is None:
+    # Initialize OpenAI on first load - after a recorded failure only Retry/Test reconnect
+    if not st.session_state.openai_available and not st.session_state.openai_error:
         get_openai_client()
     
     # Sidebar - Always visible
@@ -165,50 +300,48 @@ def main():
             
             if st.session_state.openai_available:
                 st.success("✅ OpenAI Connected")
-                if st.button("Test AI", key="sidebar_test_ai"):
-                    success, message = test_openai_connection()
-                    if success:
-                        st.success(f"Response: {message}")
-                    else:
-                        st.error(f"Error: {message}")
-                    st.rerun()
+                # The status above reflects the result on the click's own rerun
+                st.button("Test AI", key="sidebar_test_ai", on_click=test_openai_connection)
+                
+                st.toggle(
+                    "Cache responses",
+                    key="cache_responses",
+                    help="Reuse answers to identical conversations (the same recent messages)."
+                )
             else:
                 st.error("❌ OpenAI Offline")
                 if st.session_state.openai_error:
                     with st.expander("Details"):
                         st.error(st.session_state.openai_error)
                 
-                if st.button("Retry Connection", key="sidebar_retry"):
-                    st.session_state.openai_client = None
-                    get_openai_client()
-                    st.rerun()
+                st.button("Retry Connection", key="sidebar_retry", on_click=get_openai_client)
             
             st.markdown("---")
             
             # Page navigation
             st.markdown("### 🗂️ Menu")
             
-            menu_items = [
-                ("🏠 Home", "home"),
-                ("📊 Dashboard", "dashboard"),
-                ("🤖 AI Assistant", "assistant"),
-                ("🔒 Security Tools", "security"),
-                ("📈 Analytics", "analytics"),
-                ("⚙️ Settings", "settings")
-            ]
-            
-            for item_name, item_id in menu_items:
-                if st.button(item_name, key=f"menu_{item_id}", use_container_width=True):
-                    st.session_state.current_page = item_id
-                    st.rerun()
+            # One radio widget instead of a button (and a forced rerun) per page.
+            # It is keyed so its identity stays fixed; pages opened from other
+            # buttons are copied into it before it renders.
+            if st.session_state.current_page not in MENU_PAGES:
+                st.session_state.current_page = MENU_PAGES[0]
+            st.session_state.menu_page = st.session_state.current_page
+            st.radio(
+                "Menu",
+                MENU_PAGES,
+                key="menu_page",
+                format_func=MENU_LABELS.get,
+                label_visibility="collapsed",
+                on_change=select_menu_page
+            )
             
             st.markdown("---")
             
             # Logout button
             if st.button("🚪 Logout", type="primary", use_container_width=True):
-                # Clear all session data
-                for key in list(st.session_state.keys()):
-                    del st.session_state[key]
+                # Clear all session data in one call
+                st.session_state.clear()
                 st.success("Logged out successfully!")
                 st.rerun()
                 
@@ -227,9 +360,8 @@ def main():
             """)
             
             # Direct login button
-            if st.button("Go to Login", type="secondary", use_container_width=True):
-                st.session_state.current_page = "login"
-                st.rerun()
+            st.button("Go to Login", type="secondary", use_container_width=True,
+                      on_click=goto, args=("login",))
     
     # Main content area
     st.title("🏢 Multi-Domain Intelligence Platform")
@@ -240,24 +372,23 @@ def main():
         show_login_page()
     else:
         # User is logged in - show appropriate page
-        if st.session_state.current_page == "home":
-            show_home_page()
-        elif st.session_state.current_page == "dashboard":
-            show_dashboard_page()
-        elif st.session_state.current_page == "assistant":
-            show_assistant_page()
-        elif st.session_state.current_page == "security":
-            show_security_page()
-        elif st.session_state.current_page == "analytics":
-            show_analytics_page()
-        elif st.session_state.current_page == "settings":
-            show_settings_page()
-        elif st.session_state.current_page == "login":
-            # If logged in but on login page, redirect to home
-            st.session_state.current_page = "home"
-            st.rerun()
-        else:
-            show_home_page()
+        # (the sidebar menu already maps a stale "login" page to home)
+        PAGES.get(st.session_state.current_page, show_home_page)()
+
+def select_menu_page():
+    """Menu callback - the radio selection becomes the current page"""
+    st.session_state.current_page = st.session_state.menu_page
+
+def goto(page):
+    """Navigation callback - switches page on the rerun the click already triggers"""
+    st.session_state.current_page = page
+
+def login_as(username):
+    """Quick-login callback - runs before the rerun triggered by the click"""
+    st.session_state.logged_in = True
+    st.session_state.username = username
+    st.session_state.user_role = DEMO_ROLES[username]
+    st.session_state.current_page = "home"
 
 def show_login_page():
     """Login page - shown when user is not logged in"""
@@ -279,26 +410,17 @@ def show_login_page():
             st.markdown("Enter your credentials to continue")
         
         username = st.text_input("Username", value="john_analyst", placeholder="Enter username")
-        password = st.text_input("Password", type="password", value="password123", placeholder="Enter password")
+        password = st.text_input("Password", type="password", placeholder="Enter password")
         
         submit = st.form_submit_button("Login", type="primary", use_container_width=True)
         
         if submit:
             # Simple authentication (can be replaced with bcrypt or database check)
-            demo_users = {
-                'john_analyst': {'password': 'password123', 'role': 'analyst'},
-                'sara_scientist': {'password': 'password123', 'role': 'scientist'},
-                'mike_admin': {'password': 'password123', 'role': 'admin'},
-                'Joel_analyst': {'password': 'password123', 'role': 'analyst'},
-                'Sara_scientist': {'password': 'password123', 'role': 'scientist'},
-                'Daniel_admin': {'password': 'password123', 'role': 'admin'}
-            }
-            
-            if username in demo_users and password == demo_users[username]['password']:
+            if (username, password) in DEMO_CREDS:
                 # Login successful
                 st.session_state.logged_in = True
                 st.session_state.username = username
-                st.session_state.user_role = demo_users[username]['role']
+                st.session_state.user_role = DEMO_ROLES[username]
                 st.session_state.current_page = "home"
                 st.success(f"Welcome, {username}!")
                 st.rerun()
@@ -309,31 +431,10 @@ def show_login_page():
     st.markdown("---")
     st.markdown("### Quick Login (Demo)")
     
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        if st.button("👨‍💻 John (Analyst)", use_container_width=True):
-            st.session_state.logged_in = True
-            st.session_state.username = "john_analyst"
-            st.session_state.user_role = "analyst"
-            st.session_state.current_page = "home"
-            st.rerun()
-    
-    with col2:
-        if st.button("👩‍🔬 Sara (Scientist)", use_container_width=True):
-            st.session_state.logged_in = True
-            st.session_state.username = "sara_scientist"
-            st.session_state.user_role = "scientist"
-            st.session_state.current_page = "home"
-            st.rerun()
-    
-    with col3:
-        if st.button("👨‍💼 Mike (Admin)", use_container_width=True):
-            st.session_state.logged_in = True
-            st.session_state.username = "mike_admin"
-            st.session_state.user_role = "admin"
-            st.session_state.current_page = "home"
-            st.rerun()
+    # Callbacks update state before the rerun the click already triggers
+    for col, (label, username) in zip(st.columns(len(QUICK_LOGINS)), QUICK_LOGINS):
+        with col:
+            st.button(label, on_click=login_as, args=(username,), use_container_width=True)
 
 def show_home_page():
     """Home page - main dashboard view"""
@@ -368,14 +469,10 @@ def show_home_page():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if st.button("📊 Go to Dashboard", use_container_width=True):
-            st.session_state.current_page = "dashboard"
-            st.rerun()
+        st.button("📊 Go to Dashboard", use_container_width=True, on_click=goto, args=("dashboard",))
     
     with col2:
-        if st.button("🤖 AI Assistant", use_container_width=True):
-            st.session_state.current_page = "assistant"
-            st.rerun()
+        st.button("🤖 AI Assistant", use_container_width=True, on_click=goto, args=("assistant",))
     
     with col3:
         if st.button("🔒 Security Scan", use_container_width=True):
@@ -385,30 +482,25 @@ def show_home_page():
     st.markdown("---")
     st.markdown("## 📋 Recent Activity")
     
-    activity_data = {
-        "Time": ["10:30", "11:15", "12:45", "14:20"],
-        "User": ["john_analyst", "sara_scientist", "mike_admin", st.session_state.username],
-        "Action": ["Login", "Data Analysis", "System Update", "Dashboard Access"],
-        "Status": ["Success", "Completed", "In Progress", "Success"]
-    }
-    
-    import pandas as pd
-    activity_df = pd.DataFrame(activity_data)
-    st.dataframe(activity_df, use_container_width=True, hide_index=True)
+    # Static four-row list - a plain table, no interactive grid
+    st.table(activity_frame(st.session_state.username))
     
     # AI Status
     if st.session_state.openai_available:
         st.markdown("---")
         st.markdown("## 🤖 AI Status: Online")
-        
-        # Quick AI test
-        if st.button("Quick AI Test", key="home_ai_test"):
-            with st.spinner("Testing AI..."):
-                success, message = test_openai_connection()
-                if success:
-                    st.success(f"✅ AI Response: {message}")
-                else:
-                    st.error(f"❌ AI Error: {message}")
+        quick_ai_test()
+
+@st.experimental_fragment
+def quick_ai_test():
+    """Quick AI test - runs as a fragment so the button only reruns this block"""
+    if st.button("Quick AI Test", key="home_ai_test"):
+        with st.spinner("Testing AI..."):
+            success, message = test_openai_connection()
+            if success:
+                st.success(f"✅ AI Response: {message}")
+            else:
+                st.error(f"❌ AI Error: {message}")
 
 def show_dashboard_page():
     """Dashboard page - uses pages/dashboard.py if available, otherwise shows built-in"""
@@ -420,13 +512,14 @@ def show_dashboard_page():
         show_login_page()
         return
     
-    try:
-        # Try to import and show the external dashboard
-        from pages.dashboard import main as dashboard_main
-        dashboard_main()
-    except ImportError:
+    if dashboard_main is None:
         # Fallback: Show built-in dashboard
         show_fallback_dashboard()
+        return
+    
+    try:
+        # Show the external dashboard
+        dashboard_main()
     except Exception as e:
         st.error(f"Dashboard error: {str(e)}")
         show_fallback_dashboard()
@@ -452,17 +545,29 @@ def show_fallback_dashboard():
     # Quick navigation
     st.markdown("### Quick Navigation")
     
-    if st.button("🔒 Security Tools"):
-        st.session_state.current_page = "security"
-        st.rerun()
-    
-    if st.button("📈 Analytics"):
-        st.session_state.current_page = "analytics"
-        st.rerun()
-    
-    if st.button("⚙️ Settings"):
-        st.session_state.current_page = "settings"
-        st.rerun()
+    st.button("🔒 Security Tools", on_click=goto, args=("security",))
+    st.button("📈 Analytics", on_click=goto, args=("analytics",))
+    st.button("⚙️ Settings", on_click=goto, args=("settings",))
+
+@st.cache_resource(show_spinner=False)
+def open_chat_store():
+    """Open the on-disk chat history store once per process (None without diskcache)"""
+    if diskcache is None:
+        return None
+    return diskcache.Cache(CHAT_CACHE_DIR)
+
+def load_chat_history(username, default):
+    """Saved chat history for a user, or the default when none is stored"""
+    store = open_chat_store()
+    if store is None:
+        return default
+    return store.get(f"chat:{username}", default)
+
+def save_chat_history(username, messages):
+    """Persist a user's chat history for a day so a refresh keeps the conversation"""
+    store = open_chat_store()
+    if store is not None:
+        store.set(f"chat:{username}", messages, expire=CHAT_CACHE_TTL)
 
 def show_assistant_page():
     """AI Assistant page"""
@@ -478,20 +583,32 @@ def show_assistant_page():
         st.warning("⚠️ OpenAI not available")
         st.info("Please configure your API key in Settings to use AI features.")
         
-        if st.button("Go to Settings"):
-            st.session_state.current_page = "settings"
-            st.rerun()
+        st.button("Go to Settings", on_click=goto, args=("settings",))
         
         return
     
-    # Initialize chat history
+    # Initialize chat history - restored from disk after a browser refresh
     if 'assistant_messages' not in st.session_state:
-        st.session_state.assistant_messages = [
-            {"role": "assistant", "content": f"Hello {st.session_state.username}! I'm your AI assistant. How can I help you today?"}
-        ]
+        st.session_state.assistant_messages = load_chat_history(
+            st.session_state.username, [
+                {"role": "assistant", "content": f"Hello {st.session_state.username}! I'm your AI assistant. How can I help you today?"}
+            ]
+        )
+    
+    # Display chat history - only the recent window unless older turns are requested
+    history = st.session_state.assistant_messages
+    older = history[:-CHAT_RENDER_WINDOW]
+    
+    # Fixed label - a label that changed with the count would reset the toggle every turn
+    if older:
+        if st.toggle("Show older messages", key="show_older_messages"):
+            for message in older:
+                with st.chat_message(message["role"]):
+                    st.markdown(message["content"])
+        else:
+            st.caption(f"{len(older)} older messages hidden")
     
-    # Display chat history
-    for message in st.session_state.assistant_messages:
+    for message in history[-CHAT_RENDER_WINDOW:]:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
     
@@ -506,28 +623,52 @@ def show_assistant_page():
         
         # Get AI response
         with st.chat_message("assistant"):
-            message_placeholder = st.empty()
-            message_placeholder.markdown("▌")
-            
             try:
+                # Shared client from the resource cache - no probe on the chat hot path
                 client = get_openai_client()
                 
                 if not client:
                     st.error("AI service unavailable")
                     return
                 
-                # Create completion
-                response = client.chat.completions.create(
-                    model="gpt-3.5-turbo",
-                    messages=st.session_state.assistant_messages,
-                    max_tokens=300
-                )
-                
-                # Get response
-                full_response = response.choices[0].message.content
+                # Stable system prompt, then the greeting plus the trailing window
+                # so prompt size stays bounded and the variable part stays at the end
+                window = st.session_state.context_window
+                if len(history) > window + 1:
+                    # Start the window on a question, never on a reply whose question was cut off
+                    start = len(history) - window
+                    if history[start]["role"] == "assistant":
+                        start += 1
+                    recent = history[:1] + history[start:]
+                else:
+                    recent = history
+                request_messages = [{"role": "system", "content": ASSISTANT_SYSTEM_PROMPT}] + recent
                 
-                # Display response
-                message_placeholder.markdown(full_response)
+                if st.session_state.get("cache_responses"):
+                    # Identical requests are answered from the cache without a network call
+                    full_response = cached_completion(
+                        client,
+                        hash_api_key(client.api_key),
+                        "gpt-3.5-turbo",
+                        request_messages,
+                        300
+                    )
+                    st.markdown(full_response)
+                else:
+                    # Stream the completion so tokens render as they arrive
+                    stream = client.chat.completions.create(
+                        model="gpt-3.5-turbo",
+                        messages=request_messages,
+                        max_tokens=300,
+                        stream=True
+                    )
+                    
+                    # Display response incrementally and collect the full text
+                    full_response = st.write_stream(
+                        chunk.choices[0].delta.content or ""
+                        for chunk in stream
+                        if chunk.choices
+                    )
                 
                 # Add to history
                 st.session_state.assistant_messages.append(
@@ -535,11 +676,18 @@ def show_assistant_page():
                 )
                 
             except Exception as e:
+                # The client is created without a probe, so a rejected key first shows up here
+                if isinstance(e, openai.AuthenticationError):
+                    st.session_state.openai_available = False
+                    st.session_state.openai_error = f"Authentication failed: {str(e)}"
+                
                 error_msg = f"⚠️ Error: {str(e)}"
-                message_placeholder.markdown(error_msg)
+                st.markdown(error_msg)
                 st.session_state.assistant_messages.append(
                     {"role": "assistant", "content": f"I encountered an error: {str(e)}"}
                 )
+            
+            save_chat_history(st.session_state.username, st.session_state.assistant_messages)
     
     # Clear chat button
     col1, col2 = st.columns([3, 1])
@@ -549,6 +697,7 @@ def show_assistant_page():
             st.session_state.assistant_messages = [
                 {"role": "assistant", "content": f"Hello {st.session_state.username}! I'm your AI assistant. How can I help you today?"}
             ]
+            save_chat_history(st.session_state.username, st.session_state.assistant_messages)
             st.rerun()
 
 def show_security_page():
@@ -565,32 +714,8 @@ def show_security_page():
     st.markdown(f"### Security Tools for {st.session_state.username}")
     
     # Role-based tools
-    if st.session_state.user_role == 'admin':
-        st.success("🛡️ Admin Security Privileges")
-        
-        tools = [
-            ("User Management", "Manage user accounts and permissions"),
-            ("Access Logs", "View system access logs"),
-            ("Security Config", "Configure security settings"),
-            ("Audit Reports", "Generate security audit reports")
-        ]
-    elif st.session_state.user_role == 'analyst':
-        st.info("📋 Analyst Security Tools")
-        
-        tools = [
-            ("Threat Analysis", "Analyze security threats"),
-            ("Incident Reports", "View and create incident reports"),
-            ("Access Review", "Review user access patterns"),
-            ("Security Dashboard", "View security metrics")
-        ]
-    else:
-        st.warning("👀 Viewer Security Access")
-        
-        tools = [
-            ("Security Status", "View current security status"),
-            ("Alerts", "View security alerts"),
-            ("Guidelines", "Security guidelines and policies")
-        ]
+    banner, message, tools = SECURITY_TOOLS.get(st.session_state.user_role, SECURITY_TOOLS['viewer'])
+    getattr(st, banner)(message)
     
     # Display tools
     for tool_name, tool_desc in tools:
@@ -612,19 +737,8 @@ def show_analytics_page():
     # Analytics tools
     st.markdown(f"### Analytics for {st.session_state.username}")
     
-    # Sample analytics
-    import pandas as pd
-    import numpy as np
-    
-    # Generate sample data
-    dates = pd.date_range(start='2024-01-01', periods=30, freq='D')
-    analytics_data = pd.DataFrame({
-        'Date': dates,
-        'Users': np.random.randint(10, 50, 30),
-        'Processes': np.random.randint(50, 200, 30),
-        'Errors': np.random.randint(0, 10, 30),
-        'Success Rate': np.random.randint(85, 100, 30)
-    })
+    # Sample data, generated once per user and reused across reruns
+    analytics_data = analytics_frame(st.session_state.username)
     
     # Display data
     st.dataframe(analytics_data, use_container_width=True)
@@ -635,10 +749,23 @@ def show_analytics_page():
     col1, col2 = st.columns(2)
     
     with col1:
-        st.line_chart(analytics_data.set_index('Date')[['Users', 'Processes']])
+        st.line_chart(analytics_data[['Users', 'Processes']])
     
     with col2:
-        st.line_chart(analytics_data.set_index('Date')[['Success Rate']])
+        st.line_chart(analytics_data[['Success Rate']])
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def analytics_frame(username):
+    """Sample analytics trend for one user - seeded from the username so it stays stable"""
+    rng = np.random.default_rng(zlib.crc32(username.encode('utf-8')))
+    dates = pd.date_range(start='2024-01-01', periods=30, freq='D')
+    return pd.DataFrame({
+        'Date': dates,
+        'Users': rng.integers(10, 50, 30),
+        'Processes': rng.integers(50, 200, 30),
+        'Errors': rng.integers(0, 10, 30),
+        'Success Rate': rng.integers(85, 100, 30)
+    }).set_index('Date')
 
 def show_settings_page():
     """Settings page"""
@@ -680,7 +807,42 @@ def show_settings_page():
     else:
         st.error("❌ OpenAI is not configured")
     
+    # Chat context size
+    st.slider(
+        "Chat context window (messages)",
+        min_value=2,
+        max_value=50,
+        key="context_window",
+        help="Number of recent messages sent to OpenAI with each question"
+    )
+    
     # API Key input
+    api_key_panel()
+    
+    # Instructions
+    st.markdown("---")
+    with st.expander("📖 Setup Instructions"):
+        st.markdown("""
+        1. **Get API key** from [OpenAI Platform](https://platform.openai.com/api-keys)
+        2. **For Streamlit Cloud:** Add to Settings → Secrets:
+           ```toml
+           OPENAI_API_KEY = "sk-your-key-here"
+           ```
+        3. **Test connection** using the button above
+        """)
+    
+    # System info
+    st.markdown("---")
+    with st.expander("🖥️ System Information"):
+        st.write(f"**Streamlit:** {st.__version__}")
+        st.write(f"**Python:** {sys.version.split()[0]}")
+        
+        st.write(f"**Pandas:** {pd.__version__}")
+        st.write(f"**OpenAI:** {openai.__version__ if openai is not None else 'Not available'}")
+
+@st.experimental_fragment
+def api_key_panel():
+    """API key entry and connection test - typing and testing only rerun this block"""
     st.subheader("API Key Configuration")
     
     api_key = st.text_input(
@@ -690,19 +852,28 @@ def show_settings_page():
         help="Enter your OpenAI API key starting with 'sk-'"
     )
     
+    force_refresh = st.checkbox(
+        "Force refresh",
+        help="Skip the cached result of the last connection test (kept for 30 seconds)"
+    )
+    
     col1, col2 = st.columns(2)
     
     with col1:
         if st.button("Test Connection", use_container_width=True):
+            if force_refresh:
+                probe_openai.clear()
             if api_key:
-                # Temporarily set key
+                # Temporarily set key and re-read secrets
                 os.environ['OPENAI_API_KEY'] = api_key
-                # Reset client
-                st.session_state.openai_client = None
+                load_secrets.clear()
                 # Test
                 success, message = test_openai_connection()
                 if success:
                     st.success(f"✅ Connected: {message}")
+                    # Check model access in parallel
+                    for model, available in check_models(api_key):
+                        st.write(f"{'✅' if available else '❌'} {model}")
                 else:
                     st.error(f"❌ Failed: {message}")
             else:
@@ -710,41 +881,21 @@ def show_settings_page():
     
     with col2:
         if st.button("Reset AI", use_container_width=True):
-            st.session_state.openai_client = None
+            build_openai_client.clear()
             st.session_state.openai_available = False
             st.session_state.openai_error = "Reset - configure API key"
             st.success("AI settings reset")
             st.rerun()
-    
-    # Instructions
-    st.markdown("---")
-    with st.expander("📖 Setup Instructions"):
-        st.markdown("""
-        1. **Get API key** from [OpenAI Platform](https://platform.openai.com/api-keys)
-        2. **For Streamlit Cloud:** Add to Settings → Secrets:
-           ```toml
-           OPENAI_API_KEY = "sk-your-key-here"
-           ```
-        3. **Test connection** using the button above
-        """)
-    
-    # System info
-    st.markdown("---")
-    with st.expander("🖥️ System Information"):
-        st.write(f"**Streamlit:** {st.__version__}")
-        st.write(f"**Python:** {sys.version.split()[0]}")
-        
-        try:
-            import pandas as pd
-            st.write(f"**Pandas:** {pd.__version__}")
-        except:
-            st.write("**Pandas:** Not available")
-        
-        try:
-            import openai
-            st.write(f"**OpenAI:** {openai.__version__}")
-        except:
-            st.write("**OpenAI:** Not available")
+
+# Page id -> render function (defined here, after the functions it refers to)
+PAGES = {
+    "home": show_home_page,
+    "dashboard": show_dashboard_page,
+    "assistant": show_assistant_page,
+    "security": show_security_page,
+    "analytics": show_analytics_page,
+    "settings": show_settings_page,
+}
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
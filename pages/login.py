@@ -1,35 +1,48 @@
 """
-Login Page - Updated for OpenAI 0.28.1
+Login Page
 """
 
 import streamlit as st
-import sys
 import os
 import bcrypt
+import hashlib
+import hmac
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEMO_PASSWORD = "password123"
+
+# scrypt cost for new hashes (16 MiB of memory per hash)
+SCRYPT_PARAMS = dict(n=2**14, r=8, p=1, dklen=32)
+
+def to_bytes(value):
+    """Encode str input as UTF-8; bytes pass through untouched."""
+    return value if isinstance(value, bytes) else value.encode('utf-8')
+
+def hash_password_scrypt(password):
+    """Hash a password with scrypt, stored as 'scrypt$<salt hex>$<hash hex>'."""
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(to_bytes(password), salt=salt, **SCRYPT_PARAMS)
+    return f"scrypt${salt.hex()}${digest.hex()}"
+
+@st.cache_resource(show_spinner=False)
+def demo_password_hash():
+    """Hash the shared demo password once per server process."""
+    return hash_password_scrypt(DEMO_PASSWORD)
 
 try:
     from database_manager import DatabaseManager
     DB_AVAILABLE = True
 except ImportError:
     DB_AVAILABLE = False
+    DEMO_USERS = {
+        'john_analyst': (1, 'john_analyst', demo_password_hash(), 'cyber_analyst', '2024-01-01'),
+        'sara_scientist': (2, 'sara_scientist', demo_password_hash(), 'data_scientist', '2024-01-01'),
+        'mike_admin': (3, 'mike_admin', demo_password_hash(), 'it_administrator', '2024-01-01')
+    }
+
     # Fallback DatabaseManager
     class DatabaseManager:
         def get_user_by_username(self, username):
-            demo_users = {
-                'john_analyst': (1, 'john_analyst', 
-                               '$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW',
-                               'cyber_analyst', '2024-01-01'),
-                'sara_scientist': (2, 'sara_scientist',
-                                  '$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW',
-                                  'data_scientist', '2024-01-01'),
-                'mike_admin': (3, 'mike_admin',
-                              '$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW',
-                              'it_administrator', '2024-01-01')
-            }
-            return demo_users.get(username)
+            return DEMO_USERS.get(username)
 
 # Page config
 st.set_page_config(
@@ -42,17 +55,43 @@ st.set_page_config(
 if 'logged_in' not in st.session_state:
     st.session_state.logged_in = False
 
+# Set AUTH_VERIFY_CACHE=1 to memoize the full scrypt/bcrypt check. Off by default:
+# the memo keeps plaintext-derived cache keys in process memory
+VERIFY_CACHE_ENABLED = os.environ.get("AUTH_VERIFY_CACHE", "0") == "1"
+
+def check_password(plain, hashed):
+    """Check a password against a scrypt hash, or a legacy bcrypt one (both bytes)."""
+    if hashed.startswith(b"scrypt$"):
+        _, salt, digest = hashed.split(b"$")
+        candidate = hashlib.scrypt(plain, salt=bytes.fromhex(salt.decode()), **SCRYPT_PARAMS)
+        return hmac.compare_digest(candidate, bytes.fromhex(digest.decode()))
+    return bcrypt.checkpw(plain, hashed)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_check_password(plain, hashed):
+    """check_password memoized per (password, hash) - repeat logins skip the key stretching."""
+    return check_password(plain, hashed)
+
 def verify_password(plain, hashed):
     """Verify password."""
+    # Normalize once; everything below works on bytes
+    plain, hashed = to_bytes(plain), to_bytes(hashed)
     try:
-        return bcrypt.checkpw(plain.encode('utf-8'), hashed.encode('utf-8'))
-    except:
-        return plain == "password123"  # Fallback for demo
+        if VERIFY_CACHE_ENABLED:
+            return cached_check_password(plain, hashed)
+        return check_password(plain, hashed)
+    except (ValueError, TypeError):
+        return plain == DEMO_PASSWORD.encode('utf-8')  # Fallback for demo
+
+@st.cache_resource(show_spinner=False)
+def get_db():
+    """One database connection per server process, shared by all login attempts."""
+    return DatabaseManager()
 
 def login_user(username, password):
     """Authenticate user."""
     try:
-        db = DatabaseManager()
+        db = get_db()
         user = db.get_user_by_username(username)
         
         if user:
@@ -78,7 +117,7 @@ def main():
     if st.session_state.get('logged_in'):
         st.success(f"Welcome back, {st.session_state.username}!")
         if st.button("Go to Dashboard"):
-            st.switch_page("pages/2_Dashboard.py")
+            st.switch_page("pages/dashboard.py")
         return
     
     # Login form